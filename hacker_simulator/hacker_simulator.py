@@ -1,5 +1,6 @@
 import time
 import sys
+import argparse
 import random
 import json
 import hashlib
@@ -9,6 +10,8 @@ from dataclasses import dataclass
 from typing import Dict, Callable, Optional, List
 from enum import Enum
 
+import mylinuxcli_instrumentation as instrumentation
+
 # ANSI color codes
 class Colors:
     HEADER = '\033[95m'
@@ -24,6 +27,7 @@ class Colors:
 # Progress animations
 PROGRESS_CHARS = ["⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏"]
 
+@instrumentation.timed
 def slow_print(text: str, delay: float = 0.03, color: Optional[str] = None, newline: bool = True) -> None:
     formatted_text = f"{color}{text}{Colors.ENDC}" if color else text
     try:
@@ -39,6 +43,7 @@ def slow_print(text: str, delay: float = 0.03, color: Optional[str] = None, newl
         if newline:
             print()
 
+@instrumentation.timed
 def animated_progress(task: str, duration: int = 3, color: Optional[str] = None) -> None:
     slow_print(task + "...", color=color, newline=False)
     start_time = time.time()
@@ -352,7 +357,8 @@ class HackingSimulator:
                     if len(args) < cmd.args:
                         slow_print("Usage: " + cmd.usage, Colors.WARNING)
                     else:
-                        cmd.func(*args)
+                        with instrumentation.span("command." + name):
+                            cmd.func(*args)
                 else:
                     slow_print("Unknown command! Try 'help'", Colors.FAIL)
             except KeyboardInterrupt:
@@ -361,7 +367,13 @@ class HackingSimulator:
             except Exception as e:
                 slow_print(f"Error: {e}", Colors.FAIL)
 
-if __name__ == "__main__":
+def main() -> None:
+    parser = argparse.ArgumentParser(prog='hacker_simulator')
+    instrumentation.add_arguments(parser)
+    instrumentation.enable('hacker_simulator', parser.parse_args())
     sim = HackingSimulator()
     sim.start()
 
+if __name__ == "__main__":
+    main()
+
@@ -1,4 +1,7 @@
 import random
+import argparse
+
+import mylinuxcli_instrumentation as instrumentation
 
 def generate_question(difficulty):
     if difficulty == 1:
@@ -19,32 +22,39 @@ def generate_question(difficulty):
         return f"Solve for x: {a}x + {b} = {a * b}", a * b - b
 
 def main():
+    parser = argparse.ArgumentParser(prog='math_game')
+    instrumentation.add_arguments(parser)
+    instrumentation.enable('math_game', parser.parse_args())
+
     score = 0
     difficulty = 1
 
     while True:
-        question, answer = generate_question(difficulty)
-        user_answer = input(question + " (type 'quit' to exit) ")
-
-        if user_answer.lower() == 'quit':
-            print("Thanks for playing!")
-            break
-
-        if user_answer.strip() == "":
-            print("Please enter a valid answer or 'quit' to exit.")
-            continue
-
-        try:
-            if float(user_answer) == answer:
-                print("Correct!")
-                score += 1
-                if score % 3 == 0:  # Increase difficulty every 3 correct answers
-                    difficulty += 1
-            else:
-                print(f"Wrong! The correct answer was {answer}.")
+        # A round is one 'question' span; the player's thinking time is also reported as 'user_wait'.
+        with instrumentation.span('question'):
+            question, answer = generate_question(difficulty)
+            with instrumentation.span('user_wait'):
+                user_answer = input(question + " (type 'quit' to exit) ")
+
+            if user_answer.lower() == 'quit':
+                print("Thanks for playing!")
                 break
-        except ValueError:
-            print("Please enter a valid number or 'quit' to exit.")
+
+            if user_answer.strip() == "":
+                print("Please enter a valid answer or 'quit' to exit.")
+                continue
+
+            try:
+                if float(user_answer) == answer:
+                    print("Correct!")
+                    score += 1
+                    if score % 3 == 0:  # Increase difficulty every 3 correct answers
+                        difficulty += 1
+                else:
+                    print(f"Wrong! The correct answer was {answer}.")
+                    break
+            except ValueError:
+                print("Please enter a valid number or 'quit' to exit.")
 
     print(f"Your final score is: {score}")
 
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+mylinuxcli.py - Single entry point for the MyLinuxCLI tools. Only the module of the
+selected tool is imported, so starting one tool never pays for the others.
+
+Usage:
+    mylinuxcli yt <args>                     YouTube CLI (see `mylinuxcli yt --help`)
+    mylinuxcli hacksim                       Hacking simulator game
+    mylinuxcli math                          Math quiz game
+    mylinuxcli compile                       Precompile every tool to bytecode
+    mylinuxcli bench startup [-r N]          Report per-tool import time
+    mylinuxcli bench find [-d DOCS] [-r N]   Time `yt find` on a synthetic index
+
+Install:
+    pip install .            (add `.[yt]` to pull in the ytcli dependencies)
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Tool name -> (module, entry point, description). Modules are imported on demand.
+TOOLS = {
+    'yt': ('ytcli.ytcli', 'main', 'YouTube search, download, playback and playlists'),
+    'hacksim': ('hacker_simulator.hacker_simulator', 'main', 'Hacking simulator game'),
+    'math': ('math_game.math_game', 'main', 'Math quiz game'),
+}
+
+
+def print_usage(out=sys.stdout):
+    print("usage: mylinuxcli <tool> [args...]\n", file=out)
+    print("tools:", file=out)
+    for name, (_, _, description) in TOOLS.items():
+        print(f"  {name:<10}{description}", file=out)
+    print("\nother commands:", file=out)
+    print(f"  {'compile':<10}Precompile every tool to bytecode", file=out)
+    print(f"  {'bench':<10}bench startup [-r N]: report per-tool import time", file=out)
+    print(f"  {'':<10}bench find [-d DOCS] [-r N]: time 'yt find' on a synthetic index", file=out)
+
+
+def run_tool(name, argv):
+    import importlib
+    module_name, entry, _ = TOOLS[name]
+    module = importlib.import_module(module_name)
+    # The tools parse sys.argv themselves; make them see only their own arguments.
+    sys.argv = [name] + list(argv)
+    return getattr(module, entry)()
+
+
+def compile_tools(quiet=True) -> bool:
+    import compileall
+    ok = True
+    for filename in ('mylinuxcli.py', 'mylinuxcli_instrumentation.py'):
+        ok = compileall.compile_file(os.path.join(ROOT, filename), quiet=1) and ok
+    for module_name, _, _ in TOOLS.values():
+        package_dir = os.path.join(ROOT, module_name.split('.')[0])
+        ok = compileall.compile_dir(package_dir, quiet=1) and ok
+    if not quiet:
+        print("Bytecode up to date." if ok else "Some files could not be compiled.")
+    return bool(ok)
+
+
+def measure_import(module_name, runs=5) -> dict:
+    """Import `module_name` in fresh interpreters and return median timings in ms."""
+    import statistics
+    import subprocess
+    import time
+    code = (
+        "import importlib, time\n"
+        "t = time.perf_counter()\n"
+        f"importlib.import_module({module_name!r})\n"
+        "print(time.perf_counter() - t)\n"
+    )
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.getenv('PYTHONPATH')])))
+    imports, walls = [], []
+    for _ in range(runs):
+        start = time.perf_counter()
+        proc = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, env=env)
+        walls.append(time.perf_counter() - start)
+        if proc.returncode != 0:
+            error = proc.stderr.strip().splitlines()
+            return {'error': error[-1] if error else f"exit code {proc.returncode}"}
+        imports.append(float(proc.stdout.strip()))
+    return {
+        'import_ms': statistics.median(imports) * 1000,
+        'wall_ms': statistics.median(walls) * 1000,
+    }
+
+
+def bench_startup(runs=5):
+    compile_tools()
+    baseline = measure_import('sys', runs)
+    print(f"{'tool':<10}{'module':<38}{'import ms':>10}{'process ms':>12}")
+    print(f"{'(python)':<10}{'':<38}{'':>10}{baseline['wall_ms']:>12.1f}")
+    for name, (module_name, _, _) in TOOLS.items():
+        result = measure_import(module_name, runs)
+        if 'error' in result:
+            print(f"{name:<10}{module_name:<38}  failed: {result['error']}")
+        else:
+            print(f"{name:<10}{module_name:<38}{result['import_ms']:>10.1f}{result['wall_ms']:>12.1f}")
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ('-h', '--help'):
+        print_usage()
+        return 0
+    name, rest = argv[0], argv[1:]
+    if name in TOOLS:
+        return run_tool(name, rest)
+    if name == 'compile':
+        return 0 if compile_tools(quiet=False) else 1
+    if name == 'bench':
+        import argparse
+        parser = argparse.ArgumentParser(prog='mylinuxcli bench')
+        parser.add_argument('what', choices=['startup', 'find'], help='What to benchmark')
+        parser.add_argument('-r', '--runs', type=int, default=5,
+                            help='Fresh interpreters per tool, or repeats per query (median is reported)')
+        parser.add_argument('-d', '--docs', type=int, default=100000,
+                            help='Videos in the synthetic index used by `find`')
+        args = parser.parse_args(rest)
+        if args.what == 'find':
+            from ytcli.ytcli import bench_find
+            bench_find(args.docs, args.runs)
+        else:
+            bench_startup(args.runs)
+        return 0
+    print(f"mylinuxcli: unknown tool '{name}'\n", file=sys.stderr)
+    print_usage(sys.stderr)
+    return 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,269 @@
+"""
+mylinuxcli_instrumentation.py - Shared profiling and timing helpers for the MyLinuxCLI tools.
+
+Every tool accepts the same flags (see `add_arguments`):
+    --profile                Run under cProfile and print the slowest functions on exit
+    --profile-stats FILE     Also dump the raw cProfile data to FILE (for pstats/snakeviz)
+    --trace-mem              Trace allocations with tracemalloc and report the top allocators
+    --profile-json FILE      Where to write the JSON report
+                             (default: ~/.mylinuxcli_profiles/<tool>-<timestamp>.json)
+
+Hot paths are wrapped in named spans (`span("load_playlists")` or `@timed`). Spans cost a
+single global lookup while instrumentation is off; once enabled, their call counts and
+timings are written to the JSON report next to the profile and memory summaries, so two
+runs can be diffed directly.
+
+`python3 -m mylinuxcli_instrumentation` runs the built-in tests.
+"""
+import os
+import sys
+import time
+from functools import wraps
+
+PROFILE_DIR = os.path.expanduser('~/.mylinuxcli_profiles')
+TOP_N = 20
+
+_session = None
+
+
+class Session:
+    def __init__(self, tool: str, profile: bool = False, stats_file=None,
+                 trace_mem: bool = False, json_file=None):
+        self.tool = tool
+        self.stats_file = stats_file
+        self.trace_mem = trace_mem
+        self.json_file = json_file or os.path.join(
+            PROFILE_DIR, f"{tool}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+        self.spans = {}
+        self.profiler = None
+        self.started = time.perf_counter()
+        if profile or stats_file:
+            import cProfile
+            self.profiler = cProfile.Profile()
+        if trace_mem:
+            import tracemalloc
+            tracemalloc.start()
+        if self.profiler:
+            self.profiler.enable()
+
+    def add(self, name: str, elapsed: float):
+        stats = self.spans.get(name)
+        if stats is None:
+            self.spans[name] = [1, elapsed, elapsed]
+        else:
+            stats[0] += 1
+            stats[1] += elapsed
+            if elapsed > stats[2]:
+                stats[2] = elapsed
+
+    def profile_report(self) -> list:
+        import pstats
+        self.profiler.disable()
+        if self.stats_file:
+            self.profiler.dump_stats(self.stats_file)
+        stats = pstats.Stats(self.profiler, stream=sys.stderr)
+        stats.sort_stats('cumulative').print_stats(TOP_N)
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)
+        return [{
+            'function': f"{filename}:{line}({func})",
+            'calls': nc,
+            'tottime_ms': round(tt * 1000, 3),
+            'cumtime_ms': round(ct * 1000, 3),
+        } for (filename, line, func), (cc, nc, tt, ct, callers) in rows[:TOP_N]]
+
+    def memory_report(self) -> dict:
+        import tracemalloc
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        top = [{
+            'location': str(stat.traceback[0]),
+            'size_kb': round(stat.size / 1024, 1),
+            'count': stat.count,
+        } for stat in snapshot.statistics('lineno')[:TOP_N]]
+        print(f"\n=== Top allocators (peak {peak / 1024:.1f} KiB) ===", file=sys.stderr)
+        for entry in top[:10]:
+            print(f"{entry['size_kb']:>10.1f} KiB {entry['count']:>7} blocks  {entry['location']}",
+                  file=sys.stderr)
+        return {'current_kb': round(current / 1024, 1), 'peak_kb': round(peak / 1024, 1), 'top': top}
+
+    def finish(self) -> dict:
+        import json
+        report = {
+            'tool': self.tool,
+            'argv': sys.argv[1:],
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'wall_ms': round((time.perf_counter() - self.started) * 1000, 3),
+            'spans': {name: {
+                'count': count,
+                'total_ms': round(total * 1000, 3),
+                'max_ms': round(worst * 1000, 3),
+            } for name, (count, total, worst) in sorted(self.spans.items())},
+        }
+        if self.profiler:
+            report['profile'] = self.profile_report()
+        if self.trace_mem:
+            report['memory'] = self.memory_report()
+        if report['spans']:
+            print("\n=== Spans ===", file=sys.stderr)
+            for name, stats in report['spans'].items():
+                print(f"{name:<32}{stats['count']:>7} calls {stats['total_ms']:>12.1f} ms total",
+                      file=sys.stderr)
+        directory = os.path.dirname(self.json_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.json_file, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Profile written to {self.json_file}", file=sys.stderr)
+        return report
+
+
+class span:
+    """Time the enclosed block under `name`; a no-op unless instrumentation is enabled."""
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.start = None
+
+    def __enter__(self):
+        if _session is not None:
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self.start is not None and _session is not None:
+            _session.add(self.name, time.perf_counter() - self.start)
+        return False
+
+
+def timed(name=None):
+    """Decorator form of `span`; defaults to the function's name."""
+    def decorator(func):
+        label = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if _session is None:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _session.add(label, time.perf_counter() - start)
+        return wrapper
+    if callable(name):
+        func, name = name, None
+        return decorator(func)
+    return decorator
+
+
+def add_arguments(parser):
+    group = parser.add_argument_group('instrumentation')
+    group.add_argument('--profile', action='store_true',
+                       help='Run under cProfile and print the slowest functions on exit')
+    group.add_argument('--profile-stats', dest='profile_stats', metavar='FILE',
+                       help='Dump raw cProfile stats to FILE')
+    group.add_argument('--trace-mem', dest='trace_mem', action='store_true',
+                       help='Report the top memory allocators (tracemalloc)')
+    group.add_argument('--profile-json', dest='profile_json', metavar='FILE',
+                       help=f'Write the JSON report to FILE (default: {PROFILE_DIR}/<tool>-<time>.json)')
+    return group
+
+
+def enable(tool: str, args):
+    """Start instrumentation if any of the flags from `add_arguments` were given.
+
+    The report is written at interpreter exit, so tools that leave through sys.exit()
+    are still measured.
+    """
+    global _session
+    if not (args.profile or args.profile_stats or args.trace_mem or args.profile_json):
+        return None
+    import atexit
+    _session = Session(tool, profile=args.profile, stats_file=args.profile_stats,
+                       trace_mem=args.trace_mem, json_file=args.profile_json)
+    atexit.register(finish)
+    return _session
+
+
+def finish():
+    global _session
+    session, _session = _session, None
+    if session is not None:
+        return session.finish()
+    return None
+
+
+def run_tests():
+    import json, tempfile, unittest
+    from types import SimpleNamespace
+
+    class InstrumentationTest(unittest.TestCase):
+        def setUp(self):
+            global _session
+            self.orig_session = _session
+            _session = None
+            self.json_file = tempfile.NamedTemporaryFile(suffix='.json', delete=False).name
+        def tearDown(self):
+            global _session
+            _session = self.orig_session
+            os.unlink(self.json_file)
+        def test_disabled_records_nothing(self):
+            @timed
+            def double(x):
+                return x * 2
+            with span('block'):
+                self.assertEqual(double(2), 4)
+            self.assertIsNone(_session)
+            self.assertIsNone(finish())
+            self.assertEqual(os.path.getsize(self.json_file), 0)
+        def test_spans_accumulate(self):
+            global _session
+            _session = Session('test', json_file=self.json_file)
+            @timed('work')
+            def work(seconds):
+                time.sleep(seconds)
+            work(0.002)
+            work(0.01)
+            with span('work'):
+                pass
+            count, total, worst = _session.spans['work']
+            self.assertEqual(count, 3)
+            self.assertGreaterEqual(worst, 0.01)
+            self.assertGreaterEqual(total, 0.012)
+            self.assertLess(worst, total)
+            self.assertEqual(list(_session.spans), ['work'])
+        def test_report_written_on_finish(self):
+            args = SimpleNamespace(profile=False, profile_stats=None, trace_mem=False,
+                                   profile_json=self.json_file)
+            self.assertIsNotNone(enable('test', args))
+            with span('a'):
+                pass
+            with span('a'):
+                pass
+            returned = finish()
+            self.assertIsNone(_session)
+            with open(self.json_file) as f:
+                report = json.load(f)
+            self.assertEqual(report, returned)
+            self.assertEqual(set(report), {'tool', 'argv', 'timestamp', 'wall_ms', 'spans'})
+            self.assertEqual(report['tool'], 'test')
+            self.assertEqual(set(report['spans']), {'a'})
+            self.assertEqual(set(report['spans']['a']), {'count', 'total_ms', 'max_ms'})
+            self.assertEqual(report['spans']['a']['count'], 2)
+            self.assertIsNone(finish())
+        def test_no_flags_no_session(self):
+            args = SimpleNamespace(profile=False, profile_stats=None, trace_mem=False, profile_json=None)
+            self.assertIsNone(enable('test', args))
+            self.assertIsNone(_session)
+
+    loader = unittest.TestLoader()
+    suite = loader.loadTestsFromTestCase(InstrumentationTest)
+    runner = unittest.TextTestRunner()
+    result = runner.run(suite)
+    sys.exit(0 if result.wasSuccessful() else 1)
+
+
+if __name__ == '__main__':
+    run_tests()
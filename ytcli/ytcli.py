@@ -22,38 +22,48 @@ Usage:
     ytcli.py play <video_id>                 Play a video in VLC or mpv
     ytcli.py playlist create <name>          Create a new playlist
     ytcli.py playlist add <name> <id>        Add video ID to a playlist
+    ytcli.py find <terms...> [-n N]          Search seen videos offline (no API quota)
+    ytcli.py find --reindex                  Rebuild the index, adding playlist/history IDs
     ytcli.py history                         Show command history
     ytcli.py test                            Run built-in tests
 
+    Any command also accepts --profile, --profile-stats FILE, --trace-mem and
+    --profile-json FILE before the command name (see mylinuxcli_instrumentation.py).
+
 Configuration files:
     CONFIG_FILE: ~/.ytcli_config             (JSON storing your API key)
     HISTORY_FILE: ~/.ytcli_history           (one JSON entry per line)
     PLAYLIST_FILE: ~/.ytcli_playlists        (JSON mapping of playlist to video IDs)
+    INDEX_FILE: ~/.ytcli_index               (memory-mapped search index used by `find`)
+    INDEX_LOG: ~/.ytcli_index.log            (index updates not yet merged into INDEX_FILE)
+                                             (.merging while a compaction runs, .lock on INDEX_FILE,
+                                              .cache holding the parsed log)
+    INDEX_ERR: ~/.ytcli_index.err            (output of the last failed background compaction)
 """
 import os
+import re
 import sys
+import math
+import mmap
+import heapq
+import struct
+import time
 import argparse
 import json
 import subprocess
+from array import array
+from bisect import bisect_left
 from datetime import datetime
 
-# Attempt to import yt-dlp with SSL check
-try:
-    from yt_dlp import YoutubeDL
-except ModuleNotFoundError as e:
-    if 'ssl' in str(e):
-        print("Error: This environment does not support 'ssl', required by yt-dlp.")
-        sys.exit(1)
-    else:
-        raise
-
-# Google API imports
-from googleapiclient.discovery import build
+import mylinuxcli_instrumentation as instrumentation
 
 # Config paths
 CONFIG_FILE = os.path.expanduser('~/.ytcli_config')
 HISTORY_FILE = os.path.expanduser('~/.ytcli_history')
 PLAYLIST_FILE = os.path.expanduser('~/.ytcli_playlists')
+INDEX_FILE = os.path.expanduser('~/.ytcli_index')
+INDEX_LOG = os.path.expanduser('~/.ytcli_index.log')
+INDEX_ERR = os.path.expanduser('~/.ytcli_index.err')
 
 # Load API key: environment first, then config file override
 API_KEY = os.getenv('YOUTUBE_API_KEY') or ""
@@ -70,12 +80,33 @@ YOUTUBE_API_VERSION = 'v3'
 
 # Helpers
 
+def load_youtube_dl():
+    # yt-dlp and the Google API client are imported on first use so commands
+    # that don't touch the network (playlist, history, setapi) start quickly.
+    try:
+        from yt_dlp import YoutubeDL
+    except ModuleNotFoundError as e:
+        if 'ssl' in str(e):
+            print("Error: This environment does not support 'ssl', required by yt-dlp.")
+            sys.exit(1)
+        else:
+            raise
+    return YoutubeDL
+
+
+def build_youtube():
+    from googleapiclient.discovery import build
+    return build(YOUTUBE_API_SERVICE_NAME, YOUTUBE_API_VERSION, developerKey=API_KEY)
+
+
+@instrumentation.timed
 def record_history(entry: dict):
     entry['timestamp'] = datetime.utcnow().isoformat()
     with open(HISTORY_FILE, 'a') as f:
         f.write(json.dumps(entry) + "\n")
 
 
+@instrumentation.timed
 def load_playlists() -> dict:
     if os.path.exists(PLAYLIST_FILE):
         try:
@@ -85,6 +116,7 @@ def load_playlists() -> dict:
     return {}
 
 
+@instrumentation.timed
 def save_playlists(plists: dict):
     with open(PLAYLIST_FILE, 'w') as f:
         json.dump(plists, f, indent=2)
@@ -106,8 +138,9 @@ def search_videos(query, max_results=5):
     if not API_KEY:
         print("Error: API key not configured. Use 'setapi' or export YOUTUBE_API_KEY.")
         sys.exit(1)
-    youtube = build(YOUTUBE_API_SERVICE_NAME, YOUTUBE_API_VERSION, developerKey=API_KEY)
-    resp = youtube.search().list(q=query, part='id,snippet', maxResults=max_results).execute()
+    with instrumentation.span('youtube_search'):
+        youtube = build_youtube()
+        resp = youtube.search().list(q=query, part='id,snippet', maxResults=max_results).execute()
     results = []
     for item in resp.get('items', []):
         if item['id']['kind'] == 'youtube#video':
@@ -119,6 +152,7 @@ def search_videos(query, max_results=5):
             })
     for i, v in enumerate(results, 1):
         print(f"{i}. {v['title']} ({v['id']}) by {v['channel']} @ {v['publishedAt']}")
+    index_videos(results)
     record_history({'action': 'search', 'query': query, 'results': len(results)})
     return results
 
@@ -126,10 +160,11 @@ def search_videos(query, max_results=5):
 def video_info(video_id):
     url = f"https://www.youtube.com/watch?v={video_id}"
     ydl_opts = {'skip_download': True, 'quiet': True}
-    with YoutubeDL(ydl_opts) as ydl:
+    with instrumentation.span('extract_info'), load_youtube_dl()(ydl_opts) as ydl:
         info = ydl.extract_info(url, download=False)
     for key in ['title', 'uploader', 'upload_date', 'view_count', 'duration', 'like_count']:
         print(f"{key.replace('_',' ').title()}: {info.get(key)}")
+    index_videos([{'id': video_id, 'title': info.get('title'), 'channel': info.get('uploader')}])
     record_history({'action': 'info', 'id': video_id})
 
 
@@ -138,7 +173,7 @@ def download_video(video_id, fmt=None):
     ydl_opts = {}
     if fmt:
         ydl_opts['format'] = f'bestvideo[ext={fmt}]+bestaudio/best[ext={fmt}]'
-    with YoutubeDL(ydl_opts) as ydl:
+    with instrumentation.span('download'), load_youtube_dl()(ydl_opts) as ydl:
         ydl.download([url])
     record_history({'action': 'download', 'id': video_id, 'format': fmt})
 
@@ -171,6 +206,7 @@ def add_to_playlist(name, video_id):
     plists[name].append(video_id)
     save_playlists(plists)
     print(f"Added video {video_id} to playlist '{name}'.")
+    index_videos([{'id': video_id, 'playlists': [name]}])
     record_history({'action': 'playlist_add', 'playlist': name, 'id': video_id})
 
 
@@ -185,30 +221,705 @@ def show_history():
         except json.JSONDecodeError:
             continue
 
+# Offline index
+#
+# INDEX_FILE is an immutable, memory-mapped inverted index over video IDs, titles,
+# channels and playlist names. New metadata is appended to INDEX_LOG as it arrives.
+# Once the log reaches INDEX_LOG_MAX_ENTRIES a detached `find --compact` process
+# renames it to INDEX_LOG.merging and merges it into a fresh INDEX_FILE, so a lookup
+# maps the base index and only parses a small, bounded log. Doc numbers are stable
+# across merges (updated docs are rewritten in place, new ones appended), which lets
+# merge_index copy everything the log does not touch straight from the old file.
+#
+# INDEX_FILE layout (native byte order throughout, sections 8-byte aligned; it is a
+# per-machine cache, and a file from another byte order fails the version check and
+# is ignored until the next rebuild):
+#     header        magic, version, doc count, term count, 8 section offsets
+#     term_offsets  uint64[terms + 1]  into term_blob
+#     term_blob     UTF-8 terms, sorted bytewise
+#     post_offsets  uint64[terms + 1]  into post_docs / post_masks
+#     post_docs     uint32[]           doc numbers, ascending per term
+#     post_masks    uint8[]            fields (FIELD_*) the term occurs in
+#     doc_offsets   uint64[docs + 1]   into doc_blob
+#     doc_blob      one JSON object per doc: id, title, channel, playlists
+
+INDEX_MAGIC = b'YTIX'
+INDEX_VERSION = 1
+INDEX_HEADER = struct.Struct('=4sIII8Q')
+INDEX_LOG_MAX_ENTRIES = 1000
+INDEX_RETRY_SECONDS = 3600
+MAX_PREFIX_TERMS = 256
+MAX_SCORED = 2000
+EXACT_BOOST = 2
+
+FIELD_ID, FIELD_TITLE, FIELD_CHANNEL, FIELD_PLAYLIST = 1, 2, 4, 8
+FIELD_WEIGHTS = {FIELD_ID: 8, FIELD_TITLE: 4, FIELD_CHANNEL: 2, FIELD_PLAYLIST: 1}
+MASK_WEIGHT = [sum(w for f, w in FIELD_WEIGHTS.items() if mask & f) for mask in range(16)]
+MASKS_BY_WEIGHT = sorted(range(1, 16), key=MASK_WEIGHT.__getitem__, reverse=True)
+
+
+def tokenize(text) -> list:
+    return re.findall(r'\w+', (text or '').lower())
+
+
+def doc_terms(doc: dict) -> dict:
+    terms = {}
+    for field, words in (
+        (FIELD_ID, [doc['id'].lower()] + tokenize(doc['id'])),
+        (FIELD_TITLE, tokenize(doc.get('title'))),
+        (FIELD_CHANNEL, tokenize(doc.get('channel'))),
+        (FIELD_PLAYLIST, [w for name in doc.get('playlists', []) for w in tokenize(name)]),
+    ):
+        for word in words:
+            terms[word] = terms.get(word, 0) | field
+    return terms
+
+
+def merge_doc(doc: dict, update: dict) -> dict:
+    for key in ('title', 'channel'):
+        if update.get(key):
+            doc[key] = update[key]
+    playlists = doc.setdefault('playlists', [])
+    for name in update.get('playlists', []):
+        if name not in playlists:
+            playlists.append(name)
+    return doc
+
+
+def build_postings(docs: list, start: int = 0) -> tuple:
+    postings = {}
+    for n, doc in enumerate(docs, start):
+        for term, mask in doc_terms(doc).items():
+            entry = postings.get(term)
+            if entry is None:
+                entry = postings[term] = (array('I'), bytearray())
+            entry[0].append(n)
+            entry[1].append(mask)
+    terms = sorted(postings, key=lambda t: t.encode())
+    return [t.encode() for t in terms], [postings[t] for t in terms]
+
+
+class IndexSegment:
+    """Term lookups shared by the memory-mapped base index and the in-memory log."""
+    n_docs = 0
+    n_terms = 0
+
+    def lower_bound(self, key: bytes, lo: int = 0) -> int:
+        hi = self.n_terms
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.term(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def expand(self, key: bytes) -> dict:
+        """Map the terms equal to or starting with `key` to their term numbers."""
+        found = {}
+        i = self.lower_bound(key)
+        for i in range(i, min(i + MAX_PREFIX_TERMS, self.n_terms)):
+            term = self.term(i)
+            if not term.startswith(key):
+                break
+            found[term] = i
+        return found
+
+    def df(self, i: int) -> int:
+        docs, masks, lo, hi = self.posting_range(i)
+        return hi - lo
+
+    def top_docs(self, i: int, weight: float, cap: int, within=None) -> dict:
+        """Score up to `cap` docs of term `i` (optionally only those `within` a set),
+        taking the best-weighted fields first."""
+        docs, masks, lo, hi = self.posting_range(i)
+        if hi - lo <= cap and within is None:
+            return {n: MASK_WEIGHT[mask] * weight
+                    for n, mask in zip(docs[lo:hi].tolist(), bytes(masks[lo:hi]))}
+        # Common term: find the best masks with bytes.find instead of decoding every posting.
+        masks = bytes(masks[lo:hi])
+        scores = {}
+        for mask in MASKS_BY_WEIGHT:
+            value = bytes([mask])
+            pos = masks.find(value)
+            while pos != -1 and len(scores) < cap:
+                n = docs[lo + pos]
+                if within is None or n in within:
+                    scores[n] = MASK_WEIGHT[mask] * weight
+                pos = masks.find(value, pos + 1)
+            if len(scores) >= cap:
+                break
+        return scores
+
+    def doc_set(self, i: int, within=None) -> set:
+        """Docs of term `i`, optionally only those in the set `within`."""
+        docs, masks, lo, hi = self.posting_range(i)
+        if within is None:
+            return set(docs[lo:hi].tolist())
+        if hi - lo <= 16 * len(within):
+            return within.intersection(docs[lo:hi].tolist())
+        found = set()
+        for n in within:
+            j = bisect_left(docs, n, lo, hi)
+            if j < hi and docs[j] == n:
+                found.add(n)
+        return found
+
+    def intersect(self, i: int, candidates) -> list:
+        """Return (doc, mask) for each of `candidates` that occurs in term `i`."""
+        docs, masks, lo, hi = self.posting_range(i)
+        if hi - lo <= 16 * len(candidates):
+            return [(n, mask) for n, mask in zip(docs[lo:hi].tolist(), bytes(masks[lo:hi]))
+                    if n in candidates]
+        found = []
+        for n in candidates:
+            j = bisect_left(docs, n, lo, hi)
+            if j < hi and docs[j] == n:
+                found.append((n, masks[j]))
+        return found
+
+    def find_id(self, video_id: str):
+        key = video_id.lower().encode()
+        i = self.lower_bound(key)
+        if i < self.n_terms and self.term(i) == key:
+            docs, masks, lo, hi = self.posting_range(i)
+            for j in range(lo, hi):
+                if masks[j] & FIELD_ID and self.doc(docs[j])['id'] == video_id:
+                    return docs[j]
+        return None
+
+
+class MappedIndex(IndexSegment):
+    def __init__(self, path: str):
+        self._mm = None
+        self._views = []
+        try:
+            with open(path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size < INDEX_HEADER.size:
+                    return
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            return
+        magic, version, n_docs, n_terms, *offsets = INDEX_HEADER.unpack_from(self._mm)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            self.close()
+            return
+        self.n_docs, self.n_terms = n_docs, n_terms
+        view = memoryview(self._mm)
+        sections = [view[start:end] for start, end in zip(offsets, offsets[1:])]
+        self._views = [view] + sections
+        (self.term_offsets, self.term_blob, self.post_offsets, self.post_docs,
+         self.post_masks, self.doc_offsets, self.doc_blob) = sections
+        self.term_offsets = self.term_offsets.cast('Q')
+        self.post_offsets = self.post_offsets.cast('Q')
+        self.post_docs = self.post_docs.cast('I')
+        self.doc_offsets = self.doc_offsets.cast('Q')
+        self._views += [self.term_offsets, self.post_offsets, self.post_docs, self.doc_offsets]
+
+    def term(self, i: int) -> bytes:
+        return bytes(self.term_blob[self.term_offsets[i]:self.term_offsets[i + 1]])
+
+    def posting_range(self, i: int) -> tuple:
+        return self.post_docs, self.post_masks, self.post_offsets[i], self.post_offsets[i + 1]
+
+    def doc(self, n: int) -> dict:
+        return json.loads(bytes(self.doc_blob[self.doc_offsets[n]:self.doc_offsets[n + 1]]))
+
+    def close(self):
+        # Views must be released before the map can be closed.
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+
+class MemoryIndex(IndexSegment):
+    def __init__(self, docs: list):
+        self.docs = docs
+        self.n_docs = len(docs)
+        self.terms, self.entries = build_postings(docs)
+        self.n_terms = len(self.terms)
+
+    def term(self, i: int) -> bytes:
+        return self.terms[i]
+
+    def posting_range(self, i: int) -> tuple:
+        docs, masks = self.entries[i]
+        return docs, masks, 0, len(docs)
+
+    def doc(self, n: int) -> dict:
+        return self.docs[n]
+
+
+def write_index(path: str, docs: list):
+    merge_index(path, IndexSegment(), {}, docs)
+
+
+def copy_run(offsets: array, source, a: int, b: int) -> tuple:
+    """Append the source offsets of items a..b-1, rebased onto `offsets`, and return
+    the (start, end) range those items span in the source."""
+    start, end = source[a], source[b]
+    shift = offsets[-1] - start
+    offsets.extend([offset + shift for offset in source[a + 1:b + 1].tolist()])
+    return start, end
+
+
+def merge_index(path: str, base: IndexSegment, replaced: dict, added: list):
+    """Write `base` to `path` with the docs in `replaced` (base doc number -> new doc)
+    rewritten in place and the `added` docs appended after them.
+
+    Doc numbers never change, so every term, posting list and doc that the update
+    does not touch is copied from the mapped base as a byte range; only the posting
+    lists of terms whose docs changed are decoded.
+    """
+    changes = {}
+    for n, doc in replaced.items():
+        old, new = doc_terms(base.doc(n)), doc_terms(doc)
+        for term in old.keys() | new.keys():
+            if old.get(term) != new.get(term):
+                changes.setdefault(term.encode(), {})[n] = new.get(term, 0)
+    appended = dict(zip(*build_postings(added, base.n_docs)))
+
+    term_offsets, post_offsets, doc_offsets = array('Q', [0]), array('Q', [0]), array('Q', [0])
+    term_blob, post_docs, post_masks, doc_blob = [], [], [], []
+
+    def copy_terms(a, b):
+        if a < b:
+            start, end = copy_run(term_offsets, base.term_offsets, a, b)
+            term_blob.append(base.term_blob[start:end])
+            start, end = copy_run(post_offsets, base.post_offsets, a, b)
+            post_docs.append(base.post_docs[start:end])
+            post_masks.append(base.post_masks[start:end])
+
+    def copy_docs(a, b):
+        if a < b:
+            start, end = copy_run(doc_offsets, base.doc_offsets, a, b)
+            doc_blob.append(base.doc_blob[start:end])
+
+    def add_doc(doc):
+        data = json.dumps(doc, separators=(',', ':')).encode()
+        doc_blob.append(data)
+        doc_offsets.append(doc_offsets[-1] + len(data))
+
+    i = 0
+    for term in sorted(changes.keys() | appended.keys()):
+        j = base.lower_bound(term, i)
+        copy_terms(i, j)
+        i = j
+        nums, masks = [], []
+        if j < base.n_terms and base.term(j) == term:
+            i = j + 1
+            docs, doc_masks, lo, hi = base.posting_range(j)
+            nums, masks = [docs[lo:hi]], [doc_masks[lo:hi]]
+        if term in changes:
+            merged = dict(zip(nums[0].tolist(), bytes(masks[0]))) if nums else {}
+            merged.update(changes[term])
+            kept = sorted(n for n, mask in merged.items() if mask)
+            nums, masks = [array('I', kept)], [bytes(merged[n] for n in kept)]
+        if term in appended:
+            nums.append(appended[term][0])
+            masks.append(appended[term][1])
+        count = sum(len(chunk) for chunk in nums)
+        if count:
+            term_blob.append(term)
+            term_offsets.append(term_offsets[-1] + len(term))
+            post_docs.extend(nums)
+            post_masks.extend(masks)
+            post_offsets.append(post_offsets[-1] + count)
+    copy_terms(i, base.n_terms)
+
+    n = 0
+    for m in sorted(replaced):
+        copy_docs(n, m)
+        add_doc(replaced[m])
+        n = m + 1
+    copy_docs(n, base.n_docs)
+    for doc in added:
+        add_doc(doc)
+
+    sections = [[term_offsets], term_blob, [post_offsets], post_docs, post_masks, [doc_offsets], doc_blob]
+    sizes = [sum(memoryview(chunk).nbytes for chunk in chunks) for chunks in sections]
+    offsets = [INDEX_HEADER.size + (-INDEX_HEADER.size % 8)]
+    for size in sizes:
+        offsets.append(offsets[-1] + size + (-size % 8))
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, base.n_docs + len(added),
+                                  len(term_offsets) - 1, *offsets))
+        for chunks in sections:
+            f.write(b'\0' * (-f.tell() % 8))
+            for chunk in chunks:
+                f.write(chunk)
+    os.replace(tmp, path)
+
+
+def parse_log(lines):
+    for line in lines:
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            continue
+
+
+def read_log(path: str):
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            yield from parse_log(f)
+
+
+def fold_updates(base: IndexSegment, updates, docs: dict, replaced: dict):
+    """Merge `updates` into `docs` (id -> doc), starting from the base doc where one
+    exists; such docs are also recorded in `replaced` under their base doc number."""
+    for update in updates:
+        doc = docs.get(update['id'])
+        if doc is None:
+            n = base.find_id(update['id'])
+            if n is None:
+                doc = {'id': update['id'], 'title': '', 'channel': '', 'playlists': []}
+            else:
+                doc = replaced[n] = base.doc(n)
+            docs[update['id']] = doc
+        merge_doc(doc, update)
+
+
+def file_key(path: str):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns
+
+
+def load_index_log(base: IndexSegment) -> tuple:
+    """Fold the log files into full docs; also return the base docs they supersede,
+    as a dict of base doc number -> new doc.
+
+    The folded log is cached in INDEX_LOG.cache along with the INDEX_FILE and .merging
+    it was folded against. While those are unchanged, only the lines appended to
+    INDEX_LOG since the cache was written are parsed.
+    """
+    import pickle
+    cache_file = INDEX_LOG + '.cache'
+    key = (file_key(INDEX_FILE), file_key(INDEX_LOG + '.merging'))
+    log_key = file_key(INDEX_LOG)
+    log_id, size = (log_key[:2], log_key[2]) if log_key else (None, 0)
+    try:
+        with open(cache_file, 'rb') as f:
+            cached = pickle.load(f)
+    except Exception:  # missing, or written by another version: fold from scratch
+        cached = None
+    if cached and cached['key'] == key and cached['log'] == log_id and cached['offset'] <= size:
+        docs, replaced, offset, log = cached['docs'], cached['replaced'], cached['offset'], cached['index']
+    else:
+        docs, replaced, offset, log = {}, {}, 0, None
+        fold_updates(base, read_log(INDEX_LOG + '.merging'), docs, replaced)
+    if offset < size:
+        with open(INDEX_LOG, 'rb') as f:
+            f.seek(offset)
+            data = f.read(size - offset)
+        # A line still being appended by another process is picked up next time.
+        data = data[:data.rfind(b'\n') + 1]
+        if data:
+            offset += len(data)
+            fold_updates(base, parse_log(data.splitlines()), docs, replaced)
+            log = None
+    if log is None:
+        log = MemoryIndex(list(docs.values()))
+        if docs:
+            tmp = cache_file + '.tmp'
+            with open(tmp, 'wb') as f:
+                pickle.dump({'key': key, 'log': log_id, 'offset': offset, 'docs': docs,
+                             'replaced': replaced, 'index': log}, f, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, cache_file)
+    return log, replaced
+
+
+@instrumentation.timed
+def compact_index(updates=(), wait=True):
+    """Merge the log into a new INDEX_FILE. Returns the doc count, or None if another
+    process is already compacting and `wait` is false."""
+    import fcntl
+    with open(INDEX_FILE + '.lock', 'w') as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | (0 if wait else fcntl.LOCK_NB))
+        except BlockingIOError:
+            return None
+        # Entries appended while the new index is written go to a fresh INDEX_LOG.
+        # A .merging file left by an interrupted run is merged first; the current
+        # log then waits for the next compaction.
+        merging = INDEX_LOG + '.merging'
+        if not os.path.exists(merging) and os.path.exists(INDEX_LOG):
+            os.replace(INDEX_LOG, merging)
+        base = MappedIndex(INDEX_FILE)
+        docs, replaced = {}, {}
+        fold_updates(base, read_log(merging), docs, replaced)
+        fold_updates(base, updates, docs, replaced)
+        replaced_ids = {doc['id'] for doc in replaced.values()}
+        added = [doc for doc in docs.values() if doc['id'] not in replaced_ids]
+        merge_index(INDEX_FILE, base, replaced, added)
+        count = base.n_docs + len(added)
+        base.close()
+        for path in (merging, INDEX_ERR):
+            if os.path.exists(path):
+                os.unlink(path)
+    return count
+
+
+def compaction_failed() -> bool:
+    # A successful compaction removes INDEX_ERR, so anything left in it is a failure.
+    return os.path.exists(INDEX_ERR) and os.path.getsize(INDEX_ERR) > 0
+
+
+def start_compaction():
+    # Merging a large index takes a while, so it runs in a detached process instead
+    # of stalling the search/info/playlist command that filled the log. Its errors
+    # go to INDEX_ERR, and after a failure it is not retried for INDEX_RETRY_SECONDS.
+    if compaction_failed() and time.time() - os.path.getmtime(INDEX_ERR) < INDEX_RETRY_SECONDS:
+        return
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [root, os.getenv('PYTHONPATH')])))
+    with open(INDEX_ERR, 'a') as err:
+        subprocess.Popen([sys.executable, '-m', 'ytcli.ytcli', 'find', '--compact'], env=env,
+                         stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                         stderr=err, start_new_session=True)
+
+
+@instrumentation.timed
+def index_videos(videos: list):
+    with open(INDEX_LOG, 'a') as f:
+        for video in videos:
+            entry = {key: video[key] for key in ('id', 'title', 'channel', 'playlists') if video.get(key)}
+            f.write(json.dumps(entry) + "\n")
+    with open(INDEX_LOG) as f:
+        entries = sum(1 for _ in f)
+    if entries >= INDEX_LOG_MAX_ENTRIES:
+        start_compaction()
+
+
+def reindex():
+    # Backfill IDs that only ever reached the playlists or the history file.
+    updates = []
+    for name, ids in load_playlists().items():
+        updates.extend({'id': video_id, 'playlists': [name]} for video_id in ids)
+    if os.path.exists(HISTORY_FILE):
+        for line in open(HISTORY_FILE):
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if entry.get('id'):
+                updates.append({'id': entry['id'], 'playlists': [entry['playlist']] if entry.get('playlist') else []})
+    count = compact_index(updates)
+    print(f"Indexed {count} videos in {INDEX_FILE}")
+
+
+def plan_query(tokens, segments: tuple) -> list:
+    """Expand each token to its terms and weight them with an IDF over all segments.
+
+    Returns one (document frequency, [(weight, term numbers per segment)]) pair per
+    token, rarest token first, or an empty list if some token matches nothing.
+    """
+    total = sum(segment.n_docs for segment in segments)
+    plan = []
+    for token in tokens:
+        key = token.encode()
+        expanded = [segment.expand(key) for segment in segments]
+        terms = sorted(set().union(*expanded))[:MAX_PREFIX_TERMS]
+        entries, token_df = [], 0
+        for term in terms:
+            nums = [found.get(term) for found in expanded]
+            df = sum(segment.df(i) for segment, i in zip(segments, nums) if i is not None)
+            weight = math.log(1 + total / df) * (EXACT_BOOST if term == key else 1)
+            entries.append((weight, nums))
+            token_df += df
+        if not entries:
+            return []
+        entries.sort(key=lambda entry: entry[0], reverse=True)
+        plan.append((token_df, entries))
+    plan.sort(key=lambda step: step[0])
+    return plan
+
+
+def score_segment(plan: list, segment: IndexSegment, s: int, limit: int, skip=()) -> tuple:
+    """Score the docs of `segment` (number `s` in the plan) that can reach the top `limit`,
+    leaving out the doc numbers in `skip`.
+
+    Returns ({doc: score}, number of matching docs that were left unranked).
+    """
+    if len(plan) == 1:
+        # One token: walk its terms best weight first, keeping only the current top
+        # `limit`, and stop once no remaining term can beat the lowest of them.
+        scores, floor = {}, 0
+        for weight, nums in plan[0][1]:
+            if nums[s] is None:
+                continue
+            if weight * MASK_WEIGHT[15] < floor:
+                break
+            # Skipped docs may take up to len(skip) of the best places.
+            for n, score in segment.top_docs(nums[s], weight, limit + len(skip)).items():
+                if score > scores.get(n, 0) and n not in skip:
+                    scores[n] = score
+            if len(scores) > limit:
+                scores = dict(heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0])))
+            if len(scores) == limit:
+                floor = min(scores.values())
+        return scores, 0
+    # Several tokens: intersect their doc sets (set operations run in C), then score
+    # the docs that match every token. If there are more than MAX_SCORED of them, only
+    # those with the best fields for the rarest token are ranked, and the rest are
+    # reported as unranked.
+    survivors = None
+    for _, entries in plan:
+        matched = [segment.doc_set(nums[s], survivors) for _, nums in entries if nums[s] is not None]
+        survivors = matched[0] if len(matched) == 1 else set().union(*matched)
+        if not survivors:
+            return {}, 0
+    if skip:
+        survivors = survivors.difference(skip)
+    unranked = max(len(survivors) - MAX_SCORED, 0)
+    if unranked:
+        chosen = set()
+        for weight, nums in plan[0][1]:
+            if nums[s] is not None and len(chosen) < MAX_SCORED:
+                chosen.update(segment.top_docs(nums[s], weight, MAX_SCORED - len(chosen), survivors))
+        survivors = chosen
+    scores = dict.fromkeys(survivors, 0)
+    for _, entries in plan:
+        entries = [(weight, nums[s]) for weight, nums in entries if nums[s] is not None]
+        if len(entries) == 1:
+            weight, i = entries[0]
+            best = {n: MASK_WEIGHT[mask] * weight for n, mask in segment.intersect(i, survivors)}
+        else:
+            best = {}
+            for weight, i in entries:
+                for n, mask in segment.intersect(i, survivors):
+                    score = MASK_WEIGHT[mask] * weight
+                    if score > best.get(n, 0):
+                        best[n] = score
+        for n, score in best.items():
+            scores[n] += score
+    return scores, unranked
+
+
+@instrumentation.timed
+def find_videos(query, limit=10):
+    if compaction_failed():
+        print(f"Warning: background index compaction failed (see {INDEX_ERR}); "
+              "run 'ytcli find --reindex' to retry.", file=sys.stderr)
+    results, unranked = [], 0
+    tokens = set(tokenize(query))
+    if tokens:
+        base = MappedIndex(INDEX_FILE)
+        log, replaced = load_index_log(base)
+        segments = (log, base)
+        plan = plan_query(tokens, segments)
+        candidates = []
+        if plan:
+            for s, segment in enumerate(segments):
+                # Base docs superseded by the log are only scored in their log version.
+                scores, skipped = score_segment(plan, segment, s, limit, () if segment is log else replaced)
+                unranked += skipped
+                candidates.extend((score, s, n) for n, score in scores.items())
+        # Ties go to the log (newer metadata), then to the older doc.
+        top = heapq.nlargest(limit, candidates, key=lambda c: (c[0], -c[1], -c[2]))
+        results = [segments[s].doc(n) for _, s, n in top]
+        base.close()
+    if not results:
+        print("No matches in the local index.")
+    for i, v in enumerate(results, 1):
+        playlists = f" [{', '.join(v['playlists'])}]" if v.get('playlists') else ''
+        print(f"{i}. {v['title'] or '?'} ({v['id']}) by {v['channel'] or '?'}{playlists}")
+    if unranked:
+        print(f"({unranked} more videos match every word but were not ranked; "
+              "add words to narrow the search.)")
+    return results
+
+# Benchmark
+
+def bench_find(n_docs=100000, runs=5):
+    """Time `find` against a synthetic index of `n_docs` videos with a nearly full log."""
+    import io, random, shutil, tempfile, itertools, statistics, contextlib
+    global INDEX_FILE, INDEX_LOG, INDEX_ERR
+    saved = INDEX_FILE, INDEX_LOG, INDEX_ERR
+    directory = tempfile.mkdtemp()
+    INDEX_FILE = os.path.join(directory, 'index')
+    INDEX_LOG, INDEX_ERR = INDEX_FILE + '.log', INDEX_FILE + '.err'
+    try:
+        rng = random.Random(1)
+        # Zipf-distributed title words: w0 and w1 are as common as 'official' or 'video'.
+        vocab = [f'w{i}' for i in range(max(n_docs // 10, 100))]
+        cum_weights = list(itertools.accumulate(1 / (i + 1) for i in range(len(vocab))))
+
+        def video(n):
+            return {'id': f'v{n:010d}', 'title': ' '.join(rng.choices(vocab, cum_weights=cum_weights, k=6)),
+                    'channel': f'channel{rng.randrange(1000)}'}
+
+        start = time.perf_counter()
+        write_index(INDEX_FILE, [video(n) for n in range(n_docs)])
+        print(f"Built a {n_docs}-video index in {time.perf_counter() - start:.1f} s")
+        with open(INDEX_LOG, 'w') as f:
+            for n in range(INDEX_LOG_MAX_ENTRIES - 1):
+                update = video(n_docs + n) if n % 3 else {'id': f'v{rng.randrange(n_docs):010d}', 'playlists': ['mix']}
+                f.write(json.dumps(update) + "\n")
+        print(f"{'query':<24}{'first ms':>10}{'median ms':>11}")
+        for query in ('w0', 'w12', 'w1234', f'v{n_docs // 2:010d}', 'w0 w1', 'w0 w1 w2', 'channel7 w0'):
+            times = []
+            for _ in range(runs + 1):
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    find_videos(query)
+                times.append((time.perf_counter() - start) * 1000)
+            print(f"{query:<24}{times[0]:>10.1f}{statistics.median(times[1:]):>11.1f}")
+        start = time.perf_counter()
+        compact_index()
+        print(f"Merged {INDEX_LOG_MAX_ENTRIES - 1} log entries in {time.perf_counter() - start:.2f} s")
+    finally:
+        INDEX_FILE, INDEX_LOG, INDEX_ERR = saved
+        shutil.rmtree(directory)
+
 # Built-in tests
 
 def run_tests():
     import tempfile, unittest
-    class PlaylistTest(unittest.TestCase):
+    class TempFilesTest(unittest.TestCase):
         def setUp(self):
             self.pfile = tempfile.NamedTemporaryFile(delete=False).name
             self.cfile = tempfile.NamedTemporaryFile(delete=False).name
             self.hfile = tempfile.NamedTemporaryFile(delete=False).name
-            global PLAYLIST_FILE, CONFIG_FILE, HISTORY_FILE
+            self.ifile = tempfile.NamedTemporaryFile(delete=False).name
+            self.lfile = self.ifile + '.log'
+            self.efile = self.ifile + '.err'
+            global PLAYLIST_FILE, CONFIG_FILE, HISTORY_FILE, INDEX_FILE, INDEX_LOG, INDEX_ERR
             self.orig_pl = PLAYLIST_FILE
             self.orig_cf = CONFIG_FILE
             self.orig_hf = HISTORY_FILE
+            self.orig_if = INDEX_FILE
+            self.orig_lf = INDEX_LOG
+            self.orig_ef = INDEX_ERR
             PLAYLIST_FILE = self.pfile
             CONFIG_FILE = self.cfile
             HISTORY_FILE = self.hfile
+            INDEX_FILE = self.ifile
+            INDEX_LOG = self.lfile
+            INDEX_ERR = self.efile
         def tearDown(self):
             os.unlink(self.pfile)
             os.unlink(self.cfile)
             os.unlink(self.hfile)
-            global PLAYLIST_FILE, CONFIG_FILE, HISTORY_FILE
+            for path in (self.ifile, self.ifile + '.lock', self.lfile, self.lfile + '.merging',
+                         self.lfile + '.cache', self.efile):
+                if os.path.exists(path):
+                    os.unlink(path)
+            global PLAYLIST_FILE, CONFIG_FILE, HISTORY_FILE, INDEX_FILE, INDEX_LOG, INDEX_ERR
             PLAYLIST_FILE = self.orig_pl
             CONFIG_FILE = self.orig_cf
             HISTORY_FILE = self.orig_hf
+            INDEX_FILE = self.orig_if
+            INDEX_LOG = self.orig_lf
+            INDEX_ERR = self.orig_ef
+    class PlaylistTest(TempFilesTest):
         def test_create_and_add(self):
             create_playlist('test')
             pl = load_playlists()
@@ -221,8 +932,153 @@ def run_tests():
             set_api_key('ABC123')
             cfg = json.load(open(CONFIG_FILE))
             self.assertEqual(cfg.get('api_key'), 'ABC123')
+    class IndexTest(TempFilesTest):
+        videos = [
+            {'id': 'dQw4w9WgXcQ', 'title': 'Never Gonna Give You Up', 'channel': 'Rick Astley'},
+            {'id': 'jNQXAC9IVRw', 'title': 'Me at the zoo', 'channel': 'jawed'},
+            {'id': 'abc-123_xyz', 'title': 'Zookeeper tour', 'channel': 'Zoo TV'},
+        ]
+        def setUp(self):
+            super().setUp()
+            global start_compaction
+            self.orig_sc = start_compaction
+            self.compactions = []
+            start_compaction = lambda: self.compactions.append(True)
+        def tearDown(self):
+            global start_compaction
+            start_compaction = self.orig_sc
+            super().tearDown()
+        def ids(self, query):
+            return [v['id'] for v in find_videos(query)]
+        def test_find_from_log(self):
+            index_videos(self.videos)
+            self.assertEqual(self.ids('never gonna'), ['dQw4w9WgXcQ'])
+            self.assertEqual(self.ids('dqw4w9wgxcq'), ['dQw4w9WgXcQ'])
+            self.assertEqual(self.ids('nothing'), [])
+        def test_prefix_ranking(self):
+            index_videos(self.videos)
+            # exact 'zoo' in a title beats a prefix match on 'zookeeper'
+            self.assertEqual(self.ids('zoo')[0], 'jNQXAC9IVRw')
+            self.assertEqual(set(self.ids('zoo')), {'jNQXAC9IVRw', 'abc-123_xyz'})
+        def test_compacted_index_with_updates(self):
+            index_videos(self.videos)
+            compact_index()
+            self.assertFalse(os.path.exists(INDEX_LOG))
+            self.assertEqual(self.ids('rick'), ['dQw4w9WgXcQ'])
+            self.assertEqual(self.ids('123'), ['abc-123_xyz'])
+            create_playlist('classics')
+            add_to_playlist('classics', 'dQw4w9WgXcQ')
+            index_videos([{'id': 'jNQXAC9IVRw', 'title': 'First video ever'}])
+            self.assertEqual(self.ids('classics'), ['dQw4w9WgXcQ'])
+            self.assertEqual(self.ids('rick classics'), ['dQw4w9WgXcQ'])
+            self.assertEqual(self.ids('first'), ['jNQXAC9IVRw'])
+            self.assertEqual(self.ids('me at the'), [])
+            compact_index()
+            self.assertEqual(self.ids('first jawed'), ['jNQXAC9IVRw'])
+            self.assertEqual(len(self.ids('zoo')), 1)
+        def test_compaction_starts_when_log_fills(self):
+            index_videos(self.videos)
+            compact_index()
+            index_videos([{'id': f'vid{n:08d}', 'title': f'Clip {n} of the day', 'channel': f'Channel {n % 50}'}
+                          for n in range(INDEX_LOG_MAX_ENTRIES - 1)])
+            self.assertEqual(self.compactions, [])
+            self.assertEqual(self.ids('zzz'), [])
+            self.assertEqual(self.ids('vid00000007'), ['vid00000007'])
+            self.assertEqual(self.compactions, [])
+            index_videos([{'id': 'last', 'title': 'Last one'}])
+            self.assertEqual(self.compactions, [True])
+        def test_entries_survive_concurrent_compaction(self):
+            index_videos(self.videos[:1])
+            os.replace(INDEX_LOG, INDEX_LOG + '.merging')  # as if a compaction were running
+            index_videos(self.videos[1:2])
+            self.assertEqual(self.ids('rick'), ['dQw4w9WgXcQ'])
+            self.assertEqual(self.ids('jawed'), ['jNQXAC9IVRw'])
+            compact_index()
+            self.assertFalse(os.path.exists(INDEX_LOG + '.merging'))
+            self.assertTrue(os.path.exists(INDEX_LOG))
+            self.assertEqual(self.ids('rick'), ['dQw4w9WgXcQ'])
+            self.assertEqual(self.ids('jawed'), ['jNQXAC9IVRw'])
+        def test_log_cache_follows_appends(self):
+            index_videos(self.videos)
+            self.assertEqual(self.ids('rick'), ['dQw4w9WgXcQ'])
+            self.assertTrue(os.path.exists(INDEX_LOG + '.cache'))
+            with open(INDEX_LOG, 'a') as f:
+                f.write('{"id": "late", "title": "Rick')  # still being written
+            self.assertEqual(self.ids('rick'), ['dQw4w9WgXcQ'])
+            with open(INDEX_LOG, 'a') as f:
+                f.write(' Roll"}\n')
+            self.assertEqual(self.ids('roll'), ['late'])
+            compact_index()
+            index_videos([{'id': 'late', 'playlists': ['mix']}])
+            self.assertEqual(self.ids('rick mix'), ['late'])
+            self.assertEqual(len(self.ids('rick')), 2)
+        def test_failed_compaction_backs_off(self):
+            import io, contextlib
+            spawned = []
+            orig_popen = subprocess.Popen
+            subprocess.Popen = lambda *args, **kwargs: spawned.append(args[0])
+            try:
+                with open(INDEX_ERR, 'w') as f:
+                    f.write('Traceback (most recent call last):\n')
+                self.orig_sc()
+                self.assertEqual(spawned, [])
+                retry = time.time() - INDEX_RETRY_SECONDS - 1
+                os.utime(INDEX_ERR, (retry, retry))
+                self.orig_sc()
+                self.assertEqual(len(spawned), 1)
+            finally:
+                subprocess.Popen = orig_popen
+            index_videos(self.videos)
+            stderr = io.StringIO()
+            with contextlib.redirect_stderr(stderr):
+                self.ids('rick')
+            self.assertIn(INDEX_ERR, stderr.getvalue())
+            compact_index()
+            self.assertFalse(compaction_failed())
+        def test_idf_shared_across_segments(self):
+            index_videos([{'id': f'vid{n:04d}', 'title': f'jazz {n}', 'channel': 'Blue Note'}
+                          for n in range(200)])
+            compact_index()
+            index_videos([{'id': 'lonely', 'title': 'Something else', 'channel': 'Other',
+                           'playlists': ['jazz nights']}])
+            ids = self.ids('jazz')
+            self.assertEqual(len(ids), 10)
+            self.assertNotIn('lonely', ids)
+            self.assertEqual(self.ids('jazz nights'), ['lonely'])
+        def test_common_terms_score_bounded_docs(self):
+            import io, contextlib
+            count = 3 * MAX_SCORED
+            videos = [{'id': f'c{n:06d}', 'title': f'common {"extra" if n % 2 else "plain"} {n}',
+                       'channel': 'Channel'} for n in range(count)]
+            videos[-1]['channel'] = 'common extra'  # best fields, but last in doc order
+            index_videos(videos)
+            compact_index()
+            base = MappedIndex(INDEX_FILE)
+            try:
+                common = base.expand(b'common')[b'common']
+                self.assertEqual(base.df(common), count)
+                self.assertEqual(len(base.top_docs(common, 1.0, 10)), 10)
+                plan = plan_query({'common'}, (base,))
+                self.assertEqual(len(score_segment(plan, base, 0, 10)[0]), 10)
+                # 'extra' matches every odd doc: MAX_SCORED are scored, the rest reported.
+                plan = plan_query({'common', 'extra'}, (base,))
+                scores, unranked = score_segment(plan, base, 0, 10)
+                self.assertEqual(len(scores), MAX_SCORED)
+                self.assertEqual(unranked, count // 2 - MAX_SCORED)
+                self.assertEqual(len(base.intersect(common, set(range(0, count, 100)))), count // 100)
+            finally:
+                base.close()
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                ids = self.ids('common extra')
+            self.assertEqual(len(ids), 10)
+            self.assertEqual(ids[0], videos[-1]['id'])
+            self.assertIn(f'{count // 2 - MAX_SCORED} more videos', out.getvalue())
+            self.assertEqual(self.ids('c000000 plain'), ['c000000'])
     loader = unittest.TestLoader()
-    suite = loader.loadTestsFromTestCase(PlaylistTest)
+    suite = unittest.TestSuite()
+    for case in (PlaylistTest, IndexTest):
+        suite.addTests(loader.loadTestsFromTestCase(case))
     runner = unittest.TextTestRunner()
     result = runner.run(suite)
     sys.exit(0 if result.wasSuccessful() else 1)
@@ -231,6 +1087,7 @@ def run_tests():
 
 def main():
     parser = argparse.ArgumentParser(prog='ytcli')
+    instrumentation.add_arguments(parser)
     sub = parser.add_subparsers(dest='cmd', required=True)
 
     # setapi
@@ -259,12 +1116,21 @@ def main():
     add = pl_sub.add_parser('add')
     add.add_argument('name', help='Playlist name')
     add.add_argument('video_id', help='YouTube video ID to add')
+    # find
+    find = sub.add_parser('find')
+    find.add_argument('terms', nargs='*', help='Words or word prefixes to look up')
+    find.add_argument('-n', '--max-results', dest='max_results', type=int, default=10,
+                      help='Number of matches to show')
+    find.add_argument('--reindex', action='store_true',
+                      help='Rebuild the index, adding IDs from playlists and history')
+    find.add_argument('--compact', action='store_true', help=argparse.SUPPRESS)
     # history
     sub.add_parser('history')
     # test
     sub.add_parser('test')
 
     args = parser.parse_args()
+    instrumentation.enable('ytcli', args)
     if args.cmd == 'setapi':
         set_api_key(args.key)
     elif args.cmd == 'search':
@@ -280,6 +1146,19 @@ def main():
             create_playlist(args.name)
         elif args.pl_cmd == 'add':
             add_to_playlist(args.name, args.video_id)
+    elif args.cmd == 'find':
+        if args.compact:
+            try:
+                compact_index(wait=False)
+            except Exception:
+                print(f"{datetime.now().isoformat()} index compaction failed:", file=sys.stderr)
+                raise
+        elif args.reindex:
+            reindex()
+        if args.terms:
+            find_videos(' '.join(args.terms), args.max_results)
+        elif not (args.reindex or args.compact):
+            find.error('give search terms or --reindex')
     elif args.cmd == 'history':
         show_history()
     elif args.cmd == 'test':